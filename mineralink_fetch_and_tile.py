@@ -5,28 +5,61 @@ Fetches GeoJSON data from ArcGIS REST endpoints, converts to vector tiles with T
 and deploys via GitHub Actions. Falls back to local sample data if sources fail.
 """
 
+import atexit
+import hashlib
+import io
+import multiprocessing
 import os
-import json
+import shutil
 import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+import certifi
+import ijson
+import numpy as np
+import orjson
 import requests
-import geopandas as gpd
-from shapely.geometry import Point, Polygon, LineString
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pyproj import Transformer
+from pyproj.exceptions import CRSError
+
+try:
+    import requests_cache
+except ImportError:  # cache is optional; plain sessions still work
+    requests_cache = None
 
 # ==============================
 # CONFIGURATION
 # ==============================
 
 OUT_TILES_DIR = "tiles"
+# Intermediates (mbtiles, input hashes, swap staging) live outside
+# tiles/ — the Pages packaging copies tiles/ wholesale, and a statewide
+# parcels mbtiles would blow GitHub's per-file push limit
+BUILD_DIR = "tile_build"
 FALLBACK_DIR = "fallback_data"
 TIPPECANOE = "tippecanoe"
+TILE_JOIN = "tile-join"
+LOG_FILE = "build_log.txt"
 
 # Maximum time to spend per dataset (seconds)
 MAX_DATASET_SECONDS = 300
 # Request timeout per chunk
 REQUEST_TIMEOUT = 45
-# Chunk grid divisions (5x5 = 25 queries per dataset)
+# Chunk grid divisions (5x5 = 25 queries per dataset, grid fallback only)
 GRID_DIVS = 5
+# Concurrent chunk fetches per dataset
+FETCH_WORKERS = 8
+# Object ids per page request (default when layer metadata has no maxRecordCount)
+PAGE_SIZE = 2000
+# Concurrent Tippecanoe runs; it is multithreaded internally, so letting
+# every dataset worker tile at once just oversubscribes the CPU
+MAX_CONCURRENT_TILE_BUILDS = 2
+# How many times a truncated grid cell may be quartered before giving up
+MAX_SUBDIV_DEPTH = 3
 
 # Datasets to fetch
 DATASETS = [
@@ -51,107 +84,638 @@ DATASETS = [
 # FUNCTIONS
 # ==============================
 
-def fetch_geojson(ds):
-    """Fetch data from ArcGIS REST endpoint, return path to GeoJSON or None."""
+_log_fh = None
+
+# Created before the dataset pool forks, so all workers share it
+_tile_sem = multiprocessing.Semaphore(MAX_CONCURRENT_TILE_BUILDS)
+
+
+def log(msg):
+    """Print a message and append it to the build log.
+
+    The log file handle is opened once in append mode and reused, so
+    logging stays O(1) per line no matter how long the build log gets.
+    """
+    global _log_fh
+    if _log_fh is None:
+        _log_fh = open(LOG_FILE, "a", buffering=1)
+        atexit.register(_log_fh.close)
+    print(msg)
+    _log_fh.write(time.strftime("[%Y-%m-%d %H:%M:%S] ") + msg + "\n")
+
+
+_session = None
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use.
+
+    One session per process means layer metadata probes, id queries and
+    every page fetch reuse the same keep-alive sockets instead of
+    re-handshaking TCP+TLS per dataset.
+    """
+    global _session
+    if _session is None:
+        _session = make_session()
+    return _session
+
+
+def make_session():
+    """Session with connection pooling and retries, shared by all chunk fetches.
+
+    When requests-cache is installed, responses are cached in SQLite and
+    revalidated with ETag/Last-Modified, so unchanged upstream data is
+    answered from disk instead of re-downloaded (persist arcgis_cache.sqlite
+    across CI runs to benefit).
+    """
+    if requests_cache is not None:
+        sess = requests_cache.CachedSession(
+            "arcgis_cache",
+            backend="sqlite",
+            # The parcel layers update about weekly; a week of cache
+            # lets restarted/retried runs skip completed chunks
+            expire_after=7 * 86400,
+            cache_control=True,
+            allowable_methods=("GET", "POST"),
+        )
+    else:
+        sess = requests.Session()
+    # Verify against the certifi bundle explicitly; TLS sessions are
+    # reused across requests via the pooled adapter below
+    sess.verify = certifi.where()
+    sess.headers["Accept-Encoding"] = "gzip, deflate"
+    sess.headers["Connection"] = "keep-alive"
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # urllib3's default method whitelist excludes POST, which would
+        # exempt the objectIds page queries — the main fetch path — from
+        # these retries. They are plain reads, safe to reissue.
+        allowed_methods=None,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+def layer_metadata(sess, url):
+    """Fetch the layer description (the /query URL's parent) as a dict."""
+    meta_url = url.rsplit("/query", 1)[0]
+    try:
+        r = sess.get(meta_url, params={"f": "pjson"}, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        return orjson.loads(r.content)
+    except Exception as e:
+        log(f"⚠️ Layer metadata query failed: {e}")
+        return {}
+
+
+# Server-internal field types that never belong in the tiles
+SKIP_FIELD_TYPES = {
+    "esriFieldTypeOID",
+    "esriFieldTypeGeometry",
+    "esriFieldTypeGlobalID",
+    "esriFieldTypeGUID",
+    "esriFieldTypeBlob",
+    "esriFieldTypeRaster",
+}
+
+
+def layer_out_fields(ds, meta):
+    """Pick the outFields list for a dataset.
+
+    An explicit `fields` entry in DATASETS wins. Otherwise auto-select
+    from the layer metadata, dropping GlobalIDs and Shape_* measure
+    columns — fetching them just bloats every feature on the wire, in
+    the GeoJSON and in the final tiles. The object id is always kept in
+    the request, whatever the source of the list: the grid fallback
+    dedups on it, and write_features strips it again before tiling.
+    """
+    oid = meta.get("objectIdField")
+    if ds.get("fields"):
+        fields = ds["fields"]
+        if oid and oid not in fields.split(","):
+            fields = f"{fields},{oid}"
+        return fields
+    keep = [
+        f["name"] for f in meta.get("fields") or []
+        if f.get("type") not in SKIP_FIELD_TYPES
+        and not f["name"].lower().startswith("shape_")
+    ]
+    if not keep:
+        return "*"
+    if oid and oid not in keep:
+        keep.append(oid)
+    return ",".join(keep)
+
+
+@lru_cache(maxsize=32)
+def get_transformer(src_wkid):
+    """Cached pyproj transformer to EPSG:4326 (PROJ pipeline setup is slow)."""
+    try:
+        return Transformer.from_crs(f"EPSG:{src_wkid}", "EPSG:4326", always_xy=True)
+    except CRSError:
+        # The servers this path exists for — the ones that ignore outSR —
+        # tend to answer in ESRI-authority CRSs (state-plane 102xxx codes
+        # and friends) that are not EPSG entries
+        return Transformer.from_crs(f"ESRI:{src_wkid}", "EPSG:4326", always_xy=True)
+
+
+def transform_arrays(xs, ys, src_wkid):
+    """Transform coordinate arrays from src_wkid to EPSG:4326."""
+    if int(src_wkid) in (3857, 102100):
+        # Spherical Mercator has a closed-form inverse; a couple of
+        # NumPy ufuncs beat going through PROJ's generic dispatcher
+        R = 6378137.0
+        return np.degrees(xs / R), np.degrees(2.0 * np.arctan(np.exp(ys / R)) - np.pi / 2.0)
+    return get_transformer(int(src_wkid)).transform(xs, ys)
+
+
+def reproject_features(features, src_wkid):
+    """Reproject ESRI JSON features to EPSG:4326 in-place and return them.
+
+    Instead of transforming one geometry at a time, all coordinates are
+    gathered into two flat NumPy arrays and pushed through a single
+    Transformer.transform() call, so PROJ runs over them in one C loop.
+    """
+    # Identity case: callers normally filter this out already, but guard
+    # here too so a transformer is never built (and run) for nothing
+    if int(src_wkid) == 4326:
+        return features
+
+    # Fast path for all-point batches (the wells layers): gather with
+    # np.fromiter and scatter straight back, no offset bookkeeping
+    geoms = [g for f in features if (g := f.get("geometry"))]
+    if all("x" in g for g in geoms):
+        n = len(geoms)
+        xs = np.fromiter((g["x"] for g in geoms), dtype=np.float64, count=n)
+        ys = np.fromiter((g["y"] for g in geoms), dtype=np.float64, count=n)
+        xs2, ys2 = transform_arrays(xs, ys, src_wkid)
+        for g, x, y in zip(geoms, xs2.tolist(), ys2.tolist()):
+            g["x"] = x
+            g["y"] = y
+        return features
+
+    # First pass: collect every coordinate and remember slice offsets
+    xs, ys = [], []
+    slices = []  # (feature, kind, per-ring/path lengths)
+    for f in features:
+        geom = f.get("geometry")
+        if not geom:
+            continue
+        if "x" in geom and "y" in geom:
+            slices.append((geom, "point", None))
+            xs.append(geom["x"])
+            ys.append(geom["y"])
+        elif "rings" in geom or "paths" in geom:
+            kind = "rings" if "rings" in geom else "paths"
+            lengths = []
+            for part in geom[kind]:
+                lengths.append(len(part))
+                for pt in part:
+                    xs.append(pt[0])
+                    ys.append(pt[1])
+            slices.append((geom, kind, lengths))
+
+    if not xs:
+        return features
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    xs2, ys2 = transform_arrays(xs, ys, src_wkid)
+
+    # Second pass: write transformed coordinates back into the geometries.
+    # ndarray.tolist() converts each slice to [[x, y], ...] in C instead
+    # of a per-coordinate Python loop.
+    coords = np.column_stack((xs2, ys2))
+    pos = 0
+    for geom, kind, lengths in slices:
+        if kind == "point":
+            geom["x"], geom["y"] = coords[pos].tolist()
+            pos += 1
+        else:
+            parts = []
+            for n in lengths:
+                parts.append(coords[pos:pos + n].tolist())
+                pos += n
+            geom[kind] = parts
+    return features
+
+
+def response_source(r):
+    """Pick the body to stream-parse from a (possibly cached) response.
+
+    requests-cache replays hits through a raw object that implements
+    read() but not readinto(); ijson's C backend reads via readinto()
+    and sees immediate EOF, so a cache hit parsed off r.raw silently
+    yields zero features. Hits are already buffered in memory anyway —
+    parse them from content; only live responses stream off the socket.
+    """
+    if getattr(r, "from_cache", False):
+        return io.BytesIO(r.content)
+    r.raw.decode_content = True  # un-gzip as bytes are read
+    return r.raw
+
+
+def collect_response(source, features):
+    """Incrementally parse a query response and append its features.
+
+    `source` is the raw response body (bytes or file-like). ijson walks
+    the JSON event stream, so the full response dict tree is never
+    materialized — memory stays at one feature at a time. Reprojects the
+    batch if the server answered in a different spatial reference.
+    """
+    wkid = latest = None
+    batch = []
+    builder = None
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "features.item" and event == "end_map":
+                batch.append(builder.value)
+                builder = None
+        elif prefix == "features.item" and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == "spatialReference.wkid":
+            wkid = value
+        elif prefix == "spatialReference.latestWkid":
+            latest = value
+
+    if batch:
+        # Some servers ignore outSR; reproject if needed
+        wkid = latest or wkid
+        if wkid and int(wkid) != 4326:
+            batch = reproject_features(batch, int(wkid))
+        features += batch
+    return len(batch)
+
+
+def fetch_by_object_ids(sess, ds, start, sink, out_fields="*", page_size=PAGE_SIZE):
+    """Fetch all features via an OBJECTID pre-pass plus parallel page queries.
+
+    One returnIdsOnly query gets the full id list, which is then split
+    into PAGE_SIZE slices fetched concurrently. Unlike the envelope
+    sweep this never fetches empty cells and never duplicates features
+    that straddle cell boundaries. Completed batches are handed to
+    `sink` in page order as soon as they are contiguous, so memory
+    holds only the out-of-order tail, never the whole dataset.
+
+    Returns True when done, False on timeout, and None if the server
+    rejects the id query so the caller can fall back to the grid sweep.
+    """
     name, url = ds["name"], ds["url"]
     xmin, ymin, xmax, ymax = ds["bbox"]
-    print(f"\n=== Fetching {name} ===")
 
-    start = time.time()
-    features = []
+    try:
+        r = sess.get(url, params={
+            "where": "1=1",
+            "geometry": f"{xmin},{ymin},{xmax},{ymax}",
+            "geometryType": "esriGeometryEnvelope",
+            "inSR": "4326",
+            "spatialRel": "esriSpatialRelIntersects",
+            "returnIdsOnly": "true",
+            "f": "json",
+        }, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        oids = orjson.loads(r.content).get("objectIds")
+    except Exception as e:
+        log(f"⚠️ {name}: id query failed ({e}), falling back to grid sweep")
+        return None
+    if oids is None:
+        log(f"⚠️ {name}: server returned no id list, falling back to grid sweep")
+        return None
+    if not oids:
+        return True
+    log(f"  {len(oids)} object ids, {(len(oids) + page_size - 1) // page_size} pages")
+
+    def fetch_page(page):
+        # POST: a 2000-id list does not fit in a GET query string
+        r = sess.post(url, data={
+            "objectIds": ",".join(map(str, page)),
+            "outFields": out_fields,
+            "returnGeometry": "true",
+            # ~0.1 m precision is plenty for z<=14 tiles and shrinks
+            # the payload; Z/M values would be dropped by tiling anyway
+            "geometryPrecision": "6",
+            "returnZ": "false",
+            "returnM": "false",
+            "f": "json",
+            "outSR": "4326",
+        }, timeout=REQUEST_TIMEOUT, stream=True)
+        r.raise_for_status()
+        try:
+            # Parse straight off the socket so the body is never
+            # buffered whole in memory
+            batch = []
+            collect_response(response_source(r), batch)
+            return batch
+        finally:
+            r.close()
 
-    for i in range(GRID_DIVS):
-        for j in range(GRID_DIVS):
+    pages = [oids[k:k + page_size] for k in range(0, len(oids), page_size)]
+    batches = {}
+    next_page = 1
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {pool.submit(fetch_page, p): n for n, p in enumerate(pages, 1)}
+        for fut in as_completed(futures):
+            n = futures[fut]
             if time.time() - start > MAX_DATASET_SECONDS:
-                print(f"⏱️ Timeout for {name}")
-                return None
-
-            x0 = xmin + (xmax - xmin) / GRID_DIVS * i
-            y0 = ymin + (ymax - ymin) / GRID_DIVS * j
-            x1 = x0 + (xmax - xmin) / GRID_DIVS
-            y1 = y0 + (ymax - ymin) / GRID_DIVS
-
-            params = {
-                "where": "1=1",
-                "geometry": f"{x0},{y0},{x1},{y1}",
-                "geometryType": "esriGeometryEnvelope",
-                "inSR": "4326",
-                "spatialRel": "esriSpatialRelIntersects",
-                "outFields": "*",
-                "returnGeometry": "true",
-                "f": "json",
-                "outSR": "4326",
-            }
+                log(f"⏱️ Timeout for {name}")
+                for pending in futures:
+                    pending.cancel()
+                return False
+            try:
+                batches[n] = fut.result()
+                log(f"  +{len(batches[n])} features (page {n}/{len(pages)})")
+            except Exception as e:
+                log(f"⚠️ Page {n} failed: {e}")
+                batches[n] = []
+            # Flush in page order so output (and its digest) is stable
+            # across runs regardless of which page finished first
+            while next_page in batches:
+                sink(batches.pop(next_page))
+                next_page += 1
+    return True
+
 
+def dedup_features(batch, seen, oid_field):
+    """Drop features whose id (or geometry) was already emitted.
+
+    Grid cells share their seam lines, so a feature intersecting a
+    boundary comes back from both neighbours. Keyed by object id when
+    the layer declares one, else by a hash of geometry plus attributes —
+    geometry alone collapses distinct features that share a location,
+    which is routine here (stacked well bores, condo parcels).
+    """
+    out = []
+    for f in batch:
+        key = None
+        if oid_field:
+            key = (f.get("attributes") or {}).get(oid_field)
+        if key is None:
+            key = hash(orjson.dumps(f.get("geometry") or {})
+                       + orjson.dumps(f.get("attributes") or {}))
+        if key not in seen:
+            seen.add(key)
+            out.append(f)
+    return out
+
+
+def fetch_by_grid(sess, ds, start, sink, out_fields="*", max_records=0, oid_field=None):
+    """Fallback: sweep the bbox as a GRID_DIVS x GRID_DIVS envelope grid.
+
+    Batches stream to `sink` in cell order, same contract as
+    fetch_by_object_ids. A cell whose response exactly fills the
+    server's record cap is almost certainly truncated, so it is split
+    into quadrants and refetched (up to MAX_SUBDIV_DEPTH levels).
+    Returns True when done, False on timeout.
+    """
+    name, url = ds["name"], ds["url"]
+    xmin, ymin, xmax, ymax = ds["bbox"]
+
+    # Grid cell edges, computed once; 6 decimals (~0.1 m) keeps the
+    # envelope strings short instead of 17-digit float repr
+    exs = np.linspace(xmin, xmax, GRID_DIVS + 1).tolist()
+    eys = np.linspace(ymin, ymax, GRID_DIVS + 1).tolist()
+
+    def fetch_cell(x0, y0, x1, y1, depth=0):
+        params = {
+            "where": "1=1",
+            "geometry": f"{x0:.6f},{y0:.6f},{x1:.6f},{y1:.6f}",
+            "geometryType": "esriGeometryEnvelope",
+            "inSR": "4326",
+            "spatialRel": "esriSpatialRelIntersects",
+            "outFields": out_fields,
+            "returnGeometry": "true",
+            "geometryPrecision": "6",
+            "returnZ": "false",
+            "returnM": "false",
+            "f": "json",
+            "outSR": "4326",
+        }
+        r = sess.get(url, params=params, timeout=REQUEST_TIMEOUT, stream=True)
+        r.raise_for_status()
+        try:
+            batch = []
+            collect_response(response_source(r), batch)
+        finally:
+            r.close()
+
+        if max_records and len(batch) >= max_records and depth < MAX_SUBDIV_DEPTH:
+            # Hit the cap: this cell is truncated, split and refetch
+            mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+            batch = []
+            for qx0, qy0, qx1, qy1 in (
+                (x0, y0, mx, my), (mx, y0, x1, my),
+                (x0, my, mx, y1), (mx, my, x1, y1),
+            ):
+                batch += fetch_cell(qx0, qy0, qx1, qy1, depth + 1)
+        return batch
+
+    def fetch_chunk(i, j):
+        return fetch_cell(exs[i], eys[j], exs[i + 1], eys[j + 1])
+
+    cells = [(i, j) for i in range(GRID_DIVS) for j in range(GRID_DIVS)]
+    batches = {}
+    next_cell = 0
+    seen = set()
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {pool.submit(fetch_chunk, i, j): n for n, (i, j) in enumerate(cells)}
+        for fut in as_completed(futures):
+            n = futures[fut]
+            i, j = cells[n]
+            if time.time() - start > MAX_DATASET_SECONDS:
+                log(f"⏱️ Timeout for {name}")
+                for pending in futures:
+                    pending.cancel()
+                return False
             try:
-                r = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-                r.raise_for_status()
-                feats = r.json().get("features", [])
-                if feats:
-                    features += feats
-                    print(f"  +{len(feats)} features ({i+1},{j+1})")
+                batches[n] = fut.result()
+                if batches[n]:
+                    log(f"  +{len(batches[n])} features ({i+1},{j+1})")
             except Exception as e:
-                print(f"⚠️ Chunk {i+1},{j+1} failed: {e}")
+                log(f"⚠️ Chunk {i+1},{j+1} failed: {e}")
+                batches[n] = []
+            # Flush in cell order so output (and its digest) is stable;
+            # dedup here, in the single-threaded flush, not in workers
+            while next_cell in batches:
+                sink(dedup_features(batches.pop(next_cell), seen, oid_field))
+                next_cell += 1
+    return True
 
-    if not features:
-        print(f"⚠️ No geometries fetched for {name}")
-        return None
 
-    # Build GeoDataFrame
-    records = []
-    for f in features:
+def write_features(fp, feats, drop_field=None):
+    """Write a batch of ESRI features to fp as GeoJSON lines; return count.
+
+    drop_field removes one attribute before it reaches the tiles — the
+    object id that is fetched for deduplication but not worth shipping.
+    """
+    written = 0
+    feat = {"type": "Feature", "geometry": None, "properties": None}
+    for f in feats:
         geom = f.get("geometry")
         props = f.get("attributes", {})
-        try:
-            if "x" in geom and "y" in geom:
-                g = Point(geom["x"], geom["y"])
-            elif "rings" in geom:
-                g = Polygon(geom["rings"][0])
-            elif "paths" in geom:
-                g = LineString(geom["paths"][0])
+        if not geom:
+            continue
+        if drop_field and props:
+            props.pop(drop_field, None)
+        # ESRI rings/paths are already [[x, y], ...] lists, so the
+        # GeoJSON geometry can be assembled without any Shapely objects
+        if "x" in geom and "y" in geom:
+            gj = {"type": "Point", "coordinates": [geom["x"], geom["y"]]}
+        elif "rings" in geom:
+            gj = {"type": "Polygon", "coordinates": geom["rings"]}
+        elif "paths" in geom:
+            paths = geom["paths"]
+            if len(paths) == 1:
+                gj = {"type": "LineString", "coordinates": paths[0]}
             else:
-                continue
-            records.append({"geometry": g, **props})
-        except Exception:
+                gj = {"type": "MultiLineString", "coordinates": paths}
+        else:
             continue
+        # Reuse one wrapper dict rather than allocating a fresh
+        # three-key dict per feature
+        feat["geometry"] = gj
+        feat["properties"] = props
+        fp.write(orjson.dumps(feat, option=orjson.OPT_APPEND_NEWLINE))
+        written += 1
+    return written
+
+
+def fetch_geojson(ds):
+    """Fetch data from ArcGIS REST endpoint, return path to GeoJSON or None."""
+    name, url = ds["name"], ds["url"]
+    log(f"\n=== Fetching {name} ===")
+
+    start = time.time()
+    sess = get_session()
+    meta = layer_metadata(sess, url)
+    out_fields = layer_out_fields(ds, meta)
+    # The object id rides along for dedup only; keep it in the output
+    # just when a dataset's explicit fields list asked for it
+    oid_field = meta.get("objectIdField")
+    drop_field = oid_field
+    if oid_field and oid_field in (ds.get("fields") or "").split(","):
+        drop_field = None
+    # Fill pages to whatever the server actually allows; each page costs
+    # a full round trip, so bigger pages mean fewer of them
+    page_size = min(int(meta.get("maxRecordCount") or PAGE_SIZE), 10000)
 
-    if not records:
-        print(f"⚠️ {name} parse failed")
+    # Each fetched (and already reprojected) batch streams straight to
+    # disk as newline-delimited GeoJSON — one feature per line, no
+    # FeatureCollection wrapper — so Tippecanoe can parse it with -P and
+    # peak memory stays at a few pages instead of the whole dataset
+    out_path = f"{name}.ndjson"
+    count = 0
+    with open(out_path, "wb") as fp:
+        def sink(batch):
+            nonlocal count
+            count += write_features(fp, batch, drop_field)
+
+        # Preferred path: one id query, then parallel pages over the id
+        # list. Grid sweep remains as a fallback for servers that reject it.
+        ok = fetch_by_object_ids(sess, ds, start, sink, out_fields, page_size)
+        if ok is None:
+            ok = fetch_by_grid(sess, ds, start, sink, out_fields,
+                               int(meta.get("maxRecordCount") or 0),
+                               oid_field)
+
+    if not ok or not count:
+        os.remove(out_path)
+        if ok:
+            log(f"⚠️ No geometries fetched for {name}")
         return None
 
-    out_path = f"{name}.geojson"
-    gdf = gpd.GeoDataFrame(records, geometry="geometry", crs="EPSG:4326")
-    gdf.to_file(out_path, driver="GeoJSON")
-    print(f"✅ Saved {name}.geojson ({len(gdf)} features)")
+    log(f"✅ Saved {out_path} ({count} features)")
     return out_path
 
 
+def file_digest(path):
+    """blake2b hex digest of a file, read in 1 MiB blocks."""
+    h = hashlib.blake2b()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
 def build_tiles(name, geojson):
     """Convert GeoJSON to vector tiles using Tippecanoe."""
     if not geojson or not os.path.exists(geojson):
-        print(f"⚠️ No GeoJSON for {name}, skipping tiling")
+        log(f"⚠️ No GeoJSON for {name}, skipping tiling")
         return False
 
     os.makedirs(OUT_TILES_DIR, exist_ok=True)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    mbtiles = os.path.join(BUILD_DIR, f"{name}.mbtiles")
     outdir = os.path.join(OUT_TILES_DIR, name)
-    os.makedirs(outdir, exist_ok=True)
 
+    # Tippecanoe dominates wall time; skip it entirely when this input
+    # already produced the tiles that are on disk
+    hash_path = os.path.join(BUILD_DIR, f"{name}.input.hash")
+    digest = file_digest(geojson)
+    try:
+        with open(hash_path) as fp:
+            prev = fp.read().strip()
+    except OSError:
+        prev = ""
+    if digest == prev and os.path.exists(mbtiles) and os.path.isdir(outdir):
+        log(f"⏭️ {name}: input unchanged, skipping tile build")
+        return True
+
+    # Tile into a single MBTiles (one SQLite write stream) rather than
+    # millions of small tile files, then extract once for GitHub Pages
     cmd = [
         TIPPECANOE,
-        "--output-to-directory", outdir,
+        "-o", mbtiles,
         "--layer", name,
         "--force",
         "--minimum-zoom=4",
         "--maximum-zoom=14",
-        geojson
+        # Dense parcel layers (TX especially) blow the 500K tile limit at
+        # low zooms; thin them there rather than failing, and keep full
+        # vertex detail at the zooms people actually inspect parcels at
+        "--drop-densest-as-needed",
+        "--simplify-only-low-zooms",
     ]
+    # The parallel reader splits the file at arbitrary newlines, which
+    # silently drops features from a pretty-printed FeatureCollection
+    # (the fallback files); only line-delimited input is safe for -P
+    if geojson.endswith(".ndjson"):
+        cmd.append("-P")
+    # Tippecanoe's spill files can exhaust a small root disk; let CI
+    # point them at a larger volume (e.g. $RUNNER_TEMP)
+    tmpdir = os.environ.get("TIPPECANOE_TMPDIR")
+    if tmpdir:
+        os.makedirs(tmpdir, exist_ok=True)
+        cmd += ["-t", tmpdir]
+    cmd.append(geojson)
 
+    env = {**os.environ, "TIPPECANOE_MAX_THREADS": str(os.cpu_count() or 1)}
     try:
-        subprocess.run(cmd, check=True)
-        print(f"✅ Built tiles for {name}")
+        with _tile_sem:
+            subprocess.run(cmd, check=True, env=env)
+            # Extract into the build area and swap in at the end, so a
+            # failed run never leaves Pages serving a half-written tree
+            # (or shipping swap debris) and old tiles are unlinked once
+            newdir = os.path.join(BUILD_DIR, name + ".new")
+            shutil.rmtree(newdir, ignore_errors=True)
+            subprocess.run([TILE_JOIN, "--force", "-e", newdir, mbtiles], check=True, env=env)
+            olddir = os.path.join(BUILD_DIR, name + ".old")
+            shutil.rmtree(olddir, ignore_errors=True)
+            if os.path.isdir(outdir):
+                os.rename(outdir, olddir)
+            os.rename(newdir, outdir)
+            shutil.rmtree(olddir, ignore_errors=True)
+        with open(hash_path, "w") as fp:
+            fp.write(digest)
+        log(f"✅ Built tiles for {name}")
         return True
     except Exception as e:
-        print(f"⚠️ Tippecanoe failed for {name}: {e}")
+        log(f"⚠️ Tippecanoe failed for {name}: {e}")
         return False
 
 
@@ -159,43 +723,52 @@ def build_tiles(name, geojson):
 # MAIN EXECUTION
 # ==============================
 
+def process_dataset(ds):
+    """Run one dataset's fetch → tile pipeline; return its name if built."""
+    geojson = fetch_geojson(ds)
+    if not geojson:
+        # use fallback if available
+        fallback = os.path.join(FALLBACK_DIR, f"{ds['name']}.geojson")
+        if os.path.exists(fallback):
+            log(f"🧩 Using fallback for {ds['name']}")
+            geojson = fallback
+        else:
+            log(f"⚠️ No fallback for {ds['name']}, skipping.")
+            return None
+
+    if build_tiles(ds["name"], geojson):
+        return ds["name"]
+    return None
+
+
 def main():
-    print("=== Starting MineraLink Tile Build ===")
+    log("=== Starting MineraLink Tile Build ===")
     os.makedirs(OUT_TILES_DIR, exist_ok=True)
-    built = []
-
-    for ds in DATASETS:
-        geojson = fetch_geojson(ds)
-        if not geojson:
-            # use fallback if available
-            fallback = os.path.join(FALLBACK_DIR, f"{ds['name']}.geojson")
-            if os.path.exists(fallback):
-                print(f"🧩 Using fallback for {ds['name']}")
-                geojson = fallback
-            else:
-                print(f"⚠️ No fallback for {ds['name']}, skipping.")
-                continue
 
-        if build_tiles(ds["name"], geojson):
-            built.append(ds["name"])
+    # Datasets are independent, so overlap their network waits and CPU
+    # across processes (the log handle is append-mode, safe across forks).
+    # One worker per dataset: the pipelines spend most of their time
+    # waiting on state servers, not on CPU, so don't cap at core count.
+    with multiprocessing.Pool(processes=len(DATASETS)) as pool:
+        built = [name for name in pool.map(process_dataset, DATASETS) if name]
 
     # If no tiles were built, use WV_wells fallback to avoid empty deploy
     if not built:
-        print("⚠️ No datasets built successfully. Creating fallback WV_wells tile set...")
+        log("⚠️ No datasets built successfully. Creating fallback WV_wells tile set...")
         fallback = os.path.join(FALLBACK_DIR, "WV_wells.geojson")
         if os.path.exists(fallback):
             build_tiles("WV_wells", fallback)
             built.append("WV_wells")
         else:
-            print("❌ No fallback WV_wells.geojson found!")
+            log("❌ No fallback WV_wells.geojson found!")
 
     # Log summary
     if built:
-        print(f"✅ Build complete. Tiles generated for: {built}")
+        log(f"✅ Build complete. Tiles generated for: {built}")
     else:
-        print("❌ No tiles generated at all!")
+        log("❌ No tiles generated at all!")
 
-    print(f"Tiles directory: {OUT_TILES_DIR}")
+    log(f"Tiles directory: {OUT_TILES_DIR}")
 
 
 if __name__ == "__main__":
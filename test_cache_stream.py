@@ -0,0 +1,59 @@
+"""Regression test: cache hits must parse through the buffered content.
+
+requests-cache replays a hit through a raw object that implements
+read() but not readinto(); ijson's C backend reads via readinto() and
+sees immediate EOF, so parsing a cached response off r.raw silently
+yields zero features and the pipeline falls back to sample data.
+response_source must route cache hits through content instead.
+"""
+
+import io
+
+import orjson
+
+import mineralink_fetch_and_tile as mlt
+
+
+class FakeCachedRaw:
+    """Mimics requests_cache.CachedHTTPResponse: read() only, no readinto()."""
+
+    def __init__(self, data):
+        self._buf = io.BytesIO(data)
+        self.decode_content = False
+
+    def read(self, n=-1):
+        return self._buf.read(n)
+
+
+class FakeResponse:
+    def __init__(self, data, from_cache):
+        self.content = data
+        self.from_cache = from_cache
+        self.raw = FakeCachedRaw(data) if from_cache else io.BytesIO(data)
+
+
+BODY = orjson.dumps({
+    "spatialReference": {"wkid": 4326},
+    "features": [
+        {"attributes": {"OBJECTID": 1}, "geometry": {"x": -81.5, "y": 38.9}},
+        {"attributes": {"OBJECTID": 2}, "geometry": {"x": -80.2, "y": 39.4}},
+    ],
+})
+
+
+def test_cache_hit_is_parsed_from_content():
+    r = FakeResponse(BODY, from_cache=True)
+    source = mlt.response_source(r)
+    assert source is not r.raw
+    feats = []
+    mlt.collect_response(source, feats)
+    assert len(feats) == 2
+
+
+def test_live_response_streams_from_raw():
+    r = FakeResponse(BODY, from_cache=False)
+    source = mlt.response_source(r)
+    assert source is r.raw
+    feats = []
+    mlt.collect_response(source, feats)
+    assert len(feats) == 2